@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import os
 import sys
 
@@ -9,6 +10,8 @@ try:
 except Exception:
     pass
 
+logger = logging.getLogger(__name__)
+
 DISCORD_TOKEN: str | None = os.getenv("DISCORD_TOKEN")
 
 _admin_id = os.getenv("ADMIN_CHANNEL_ID")
@@ -24,6 +27,14 @@ LMSTUDIO_API_KEY: str | None = os.getenv("LMSTUDIO_API_KEY")
 
 LMSTUDIO_TIMEOUT: int = int(os.getenv("LMSTUDIO_TIMEOUT_SECS", "120"))
 LM_USE_TOOLS: bool = os.getenv("LM_USE_TOOLS", "0").lower() in {"1", "true", "yes", "on"}
+# Maximum number of LM Studio completions allowed in flight at once.
+LMSTUDIO_CONCURRENCY: int = max(1, int(os.getenv("LMSTUDIO_CONCURRENCY", "2")))
+# How many articles to fetch and summarize in one LM Studio call when the
+# moderation queue is empty.
+LM_BATCH_SIZE: int = max(1, int(os.getenv("LM_BATCH_SIZE", "3")))
+
+# Where pending moderation state is kept between restarts.
+STATE_FILE: str = os.getenv("STATE_FILE", "state.json")
 
 
 def ensure_token() -> None:
@@ -33,9 +44,9 @@ def ensure_token() -> None:
     the token is missing, rather than failing later during connection.
     """
     if not DISCORD_TOKEN or not isinstance(DISCORD_TOKEN, str) or not DISCORD_TOKEN.strip():
-        print("❌ ERROR: DISCORD_TOKEN is not set. Set it in your environment or a .env file.")
-        print("   Example (macOS/Linux): export DISCORD_TOKEN=\"<your-bot-token>\"")
-        print("   Or create a .env file with: DISCORD_TOKEN=<your-bot-token>")
+        logger.error("❌ DISCORD_TOKEN is not set. Set it in your environment or a .env file.")
+        logger.error("   Example (macOS/Linux): export DISCORD_TOKEN=\"<your-bot-token>\"")
+        logger.error("   Or create a .env file with: DISCORD_TOKEN=<your-bot-token>")
         sys.exit(1)
 
 
@@ -56,6 +67,6 @@ def ensure_required() -> None:
         missing.append("LMSTUDIO_MODEL")
 
     if missing:
-        print("❌ ERROR: Missing required config keys:", ", ".join(missing))
-        print("   Add them to your .env or environment. See .env.example for placeholders.")
+        logger.error("❌ Missing required config keys: %s", ", ".join(missing))
+        logger.error("   Add them to your .env or environment. See .env.example for placeholders.")
         sys.exit(1)
\ No newline at end of file
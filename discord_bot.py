@@ -2,131 +2,232 @@
 from __future__ import annotations
 
 import discord
+import logging
+from collections import OrderedDict
 from discord.ext import commands
-from typing import Dict, Iterable, Set
+from typing import Dict, Iterable, Optional, Set
 
 # Import configuration and state via absolute imports. Absolute imports
 # allow the module to be executed without being part of a package.
 from config import ADMIN_CHANNEL_ID, POST_CHANNEL_ID
-from state import unactioned_articles, unactioned_articles_lock
+from http_session import close_session
+from state import load_state, pending_articles, save_state
+
+logger = logging.getLogger(__name__)
 
 intents = discord.Intents.default()
 intents.messages = True
 intents.message_content = True
 
+
+class NewsBot(commands.Bot):
+    # Bot that also releases the shared HTTP session on shutdown.
+
+    async def close(self) -> None:
+        await close_session()
+        await super().close()
+
+
 # Create a global bot instance. Other modules import this to
 # schedule tasks and access Discord API functionality.
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = NewsBot(command_prefix="!", intents=intents)
 
+# Admin and public channels, looked up once by resolve_channels() (called
+# from on_ready) rather than on every article.
+admin_channel: Optional[discord.TextChannel] = None
+post_channel: Optional[discord.TextChannel] = None
 
-async def get_all_recent_bot_article_urls(channel: discord.TextChannel) -> Set[str]:
-    """The bot scans the last 50 messages in the given channel and
-    collects links. Avoids picking up duplicates.
+
+def _text_channel(channel_id: Optional[int]) -> Optional[discord.TextChannel]:
+    channel = bot.get_channel(channel_id) if channel_id is not None else None
+    return channel if isinstance(channel, discord.TextChannel) else None
+
+
+def resolve_channels() -> None:
+    # Look up the admin and public channels and cache them at module scope.
+    global admin_channel, post_channel
+    admin_channel = _text_channel(ADMIN_CHANNEL_ID)
+    post_channel = _text_channel(POST_CHANNEL_ID)
+
+
+# Links of recently posted articles, used to skip duplicates without
+# re-reading channel history on every fetch. An OrderedDict gives O(1)
+# membership plus insertion order, so it doubles as a bounded LRU: the
+# least recently posted link is evicted once _RECENT_MAX is reached.
+_RECENT_MAX = 500
+# History scans stop once this many links have been collected.
+RECENT_SCAN_TARGET = 30
+# Position of the "Link" field in embeds built by _build_article_embed.
+LINK_FIELD_INDEX = 1
+_recent_urls: OrderedDict[str, None] = OrderedDict()
+
+
+def remember_article_url(url: object) -> None:
+    # Record a posted article link in the recent-URL cache.
+    if not url:
+        return
+    link = str(url)
+    _recent_urls[link] = None
+    _recent_urls.move_to_end(link)
+    if len(_recent_urls) > _RECENT_MAX:
+        _recent_urls.popitem(last=False)
+
+
+async def _scan_recent_bot_article_urls(channel: discord.TextChannel) -> Set[str]:
+    """The bot scans up to the last 50 messages in the given channel and
+    collects article links, stopping early once ``RECENT_SCAN_TARGET``
+    links have been found. Avoids picking up duplicates.
     """
     urls: Set[str] = set()
     async for message in channel.history(limit=50):
-        if message.author == bot.user and message.embeds:
-            for embed in message.embeds:
-                for field in embed.fields:
-                    if field.name == "Link":
-                        urls.add(str(field.value))
+        if not message.embeds or message.author != bot.user:
+            continue
+        for embed in message.embeds:
+            fields = embed.to_dict().get("fields") or []
+            # _build_article_embed always puts the link at LINK_FIELD_INDEX;
+            # only older or foreign embeds need the full field scan.
+            if len(fields) > LINK_FIELD_INDEX and fields[LINK_FIELD_INDEX].get("name") == "Link":
+                urls.add(str(fields[LINK_FIELD_INDEX].get("value")))
+                continue
+            for field in fields:
+                if field.get("name") == "Link":
+                    urls.add(str(field.get("value")))
+                    break
+        # Enough links to cover the dedup window; stop paginating early.
+        if len(urls) >= RECENT_SCAN_TARGET:
+            break
     return urls
 
 
-async def send_moderation_message(article: Dict[str, object]) -> None:
-    # Sends a message to the admin channel for moderation
+async def get_all_recent_bot_article_urls(channel: discord.TextChannel) -> Set[str]:
+    """Return the links of recently posted articles.
 
-    channel = bot.get_channel(ADMIN_CHANNEL_ID)
-    if channel is None or not isinstance(channel, discord.TextChannel):
-        print("❌ ERROR: ADMIN_CHANNEL_ID is invalid or the bot has no access to it.")
+    Served from the in-memory cache; the channel history is only scanned
+    to hydrate the cache when it is still empty (cold start).
+    """
+    if not _recent_urls:
+        for url in await _scan_recent_bot_article_urls(channel):
+            remember_article_url(url)
+        logger.info("✅ Loaded %d recent article links from #%s.", len(_recent_urls), channel.name)
+    return set(_recent_urls)
+
+
+async def seed_recent_article_urls() -> None:
+    # Populate the recent-URL cache once at startup: from the saved state
+    # file when there is one, otherwise from the admin channel history.
+    saved_urls = load_state()
+    if saved_urls is not None:
+        for url in saved_urls:
+            remember_article_url(url)
+        # Reattach the buttons of review messages sent before the restart.
+        for article in pending_articles.values():
+            bot.add_view(ArticleModerationView(article))
         return
 
+    if admin_channel is None:
+        logger.error("❌ ADMIN_CHANNEL_ID is invalid or the bot has no access to it.")
+        return
+    await get_all_recent_bot_article_urls(admin_channel)
+
+
+def _build_article_embed(article: Dict[str, object]) -> discord.Embed:
+    # Build the article embed shared by the moderation and public posts.
+
     summary = article.get("summary")
-    title_fallback = str(article.get("title", ""))
 
     # Determine the title: prefer structured summary title if available
     if isinstance(summary, dict) and summary.get("title"):
         title_text = str(summary.get("title"))
     else:
-        title_text = title_fallback
+        title_text = str(article.get("title", ""))
 
     # Build the embed based on whether we have a structured summary
     if isinstance(summary, dict):
-        key_points = summary.get("key_points", [])
-        bullets = "\n".join(f"- {pt}" for pt in key_points)
-        description = bullets
-        embed = discord.Embed(title=title_text[:256], description=description[:4000])
-        embed.add_field(name="Source", value=str(article.get("source", "")))
-        embed.add_field(name="Link", value=str(article.get("link", "")), inline=False)
+        description = "\n".join(f"- {pt}" for pt in summary.get("key_points", []))
+    else:
+        description = str(summary)
+
+    embed = discord.Embed(title=title_text[:256], description=description[:4000])
+    # Field order matters: the history scan reads "Link" at LINK_FIELD_INDEX.
+    embed.add_field(name="Source", value=str(article.get("source", "")))
+    embed.add_field(name="Link", value=str(article.get("link", "")), inline=False)
+    if isinstance(summary, dict):
         why = summary.get("why_it_matters")
         if why:
             embed.add_field(name="Why it matters", value=str(why), inline=False)
-    else:
-        embed = discord.Embed(title=title_text[:256], description=str(summary)[:4000])
-        embed.add_field(name="Source", value=str(article.get("source", "")))
-        embed.add_field(name="Link", value=str(article.get("link", "")), inline=False)
+    return embed
+
 
+async def send_moderation_message(article: Dict[str, object]) -> None:
+    # Sends a message to the admin channel for moderation
+
+    if admin_channel is None:
+        resolve_channels()
+    channel = admin_channel
+    if channel is None:
+        logger.error("❌ ADMIN_CHANNEL_ID is invalid or the bot has no access to it.")
+        return
+
+    embed = _build_article_embed(article)
+    # Keep the embed so acceptance can post it without rebuilding it.
+    article["_embed"] = embed
     view = ArticleModerationView(article)
     await channel.send("New article for review:", embed=embed, view=view)
+    remember_article_url(article.get("link"))
+    save_state(_recent_urls)
 
 
 async def post_to_public_channel(article: Dict[str, object]) -> None:
     # Post an approved article to the public channel
 
-    channel = bot.get_channel(POST_CHANNEL_ID)
-    if channel is None or not isinstance(channel, discord.TextChannel):
-        print("❌ ERROR: POST_CHANNEL_ID is invalid or the bot has no access to it.")
+    if post_channel is None:
+        resolve_channels()
+    channel = post_channel
+    if channel is None:
+        logger.error("❌ POST_CHANNEL_ID is invalid or the bot has no access to it.")
         return
 
-    summary = article.get("summary")
-    title_fallback = str(article.get("title", ""))
-    if isinstance(summary, dict) and summary.get("title"):
-        title_text = str(summary.get("title"))
-    else:
-        title_text = title_fallback
-
-    if isinstance(summary, dict):
-        bullets = "\n".join(f"- {pt}" for pt in summary.get("key_points", []))
-        description = bullets
-        embed = discord.Embed(title=title_text[:256], description=description[:4000])
-        embed.add_field(name="Source", value=str(article.get("source", "")))
-        embed.add_field(name="Link", value=str(article.get("link", "")), inline=False)
-        why = summary.get("why_it_matters")
-        if why:
-            embed.add_field(name="Why it matters", value=str(why), inline=False)
-    else:
-        embed = discord.Embed(title=title_text[:256], description=str(summary)[:4000])
-        embed.add_field(name="Source", value=str(article.get("source", "")))
-        embed.add_field(name="Link", value=str(article.get("link", "")), inline=False)
-
+    embed = article.get("_embed")
+    if not isinstance(embed, discord.Embed):
+        embed = _build_article_embed(article)
     await channel.send(embed=embed)
+    remember_article_url(article.get("link"))
 
 
 class ArticleModerationView(discord.ui.View):
     # Interactive view for moderators to accept or reject articles.
+    #
+    # The view never times out and its button ids are derived from the
+    # article ``_id``, so it can be re-registered with bot.add_view after a
+    # restart and the original review message keeps working.
 
     def __init__(self, article: Dict[str, object]) -> None:
-        super().__init__()
+        super().__init__(timeout=None)
         self.article = article
+        self.article_id = str(article.get("_id"))
+        self.accept.custom_id = f"news:accept:{self.article_id}"
+        self.reject.custom_id = f"news:reject:{self.article_id}"
 
     @discord.ui.button(label="✅ Accept", style=discord.ButtonStyle.success)
     async def accept(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:  # type: ignore[override]
         # Acknowledge the interaction immediately to avoid timeouts
         await interaction.response.defer(ephemeral=True)
 
-        # Remove the article from the unactioned list under lock
-        async with unactioned_articles_lock:
-            if self.article in unactioned_articles:
-                unactioned_articles.remove(self.article)
-                print(
-                    f"✅ Article approved by {interaction.user.name}: {self.article.get('title')} ({self.article.get('link')})"
-                )
-            else:
-                await interaction.followup.send(
-                    "⚠️ This article has already been moderated or is no longer available.",
-                    ephemeral=True,
-                )
-                return
+        if pending_articles.pop(self.article_id, None) is None:
+            await interaction.followup.send(
+                "⚠️ This article has already been moderated or is no longer available.",
+                ephemeral=True,
+            )
+            return
+        # Moderated: drop this view from discord.py's persistent view store.
+        self.stop()
+        logger.info(
+            "✅ Article approved by %s: %s (%s)",
+            interaction.user.name,
+            self.article.get("title"),
+            self.article.get("link"),
+        )
+        save_state(_recent_urls)
 
         await interaction.followup.send(
             f"Accepted ✅ by {interaction.user.name}. Posting now...",
@@ -142,18 +243,20 @@ class ArticleModerationView(discord.ui.View):
     @discord.ui.button(label="❌ Reject", style=discord.ButtonStyle.danger)
     async def reject(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:  # type: ignore[override]
         await interaction.response.defer(ephemeral=True)
-        async with unactioned_articles_lock:
-            if self.article in unactioned_articles:
-                unactioned_articles.remove(self.article)
-                print(
-                    f"❌ Article rejected by {interaction.user.name}: {self.article.get('title')} ({self.article.get('link')})"
-                )
-            else:
-                await interaction.followup.send(
-                    "⚠️ This article has already been moderated or is no longer available.",
-                    ephemeral=True,
-                )
-                return
+        if pending_articles.pop(self.article_id, None) is None:
+            await interaction.followup.send(
+                "⚠️ This article has already been moderated or is no longer available.",
+                ephemeral=True,
+            )
+            return
+        self.stop()
+        logger.info(
+            "❌ Article rejected by %s: %s (%s)",
+            interaction.user.name,
+            self.article.get("title"),
+            self.article.get("link"),
+        )
+        save_state(_recent_urls)
 
         await interaction.followup.send(
             f"Rejected ❌ by {interaction.user.name}.",
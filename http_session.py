@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Optional, Union
+
+import aiohttp
+
+from config import LMSTUDIO_TIMEOUT
+
+# Prefer orjson for encoding request bodies and decoding responses; it is
+# several times faster than the stdlib on the multi-KB LM Studio and
+# NewsAPI payloads. Fall back to ``json`` when it is not installed.
+try:
+    import orjson  # type: ignore
+
+    def json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def json_loads(data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+except ImportError:
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def json_loads(data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+# A single pooled aiohttp session shared by the LM Studio and NewsAPI
+# helpers; discord.py keeps its own for the Discord API. Requests are
+# awaited on the bot's event loop instead of blocking it, and keep-alive
+# connections (and their TLS handshakes) are reused across calls.
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    # Return the shared session, creating it lazily on the running loop.
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, limit_per_host=10, keepalive_timeout=90),
+            timeout=aiohttp.ClientTimeout(total=LMSTUDIO_TIMEOUT),
+        )
+    return _session
+
+
+async def close_session() -> None:
+    # Close the shared session; called when the bot shuts down.
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
-import requests
-from typing import Any, Dict, List, Optional
+import logging
+import time
+import aiohttp
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 # Import configuration constants from the sibling module. We use
 # absolute imports here so that these modules can be executed
@@ -14,196 +18,528 @@ from config import (
     LMSTUDIO_API_KEY,
     LMSTUDIO_TIMEOUT,
     LM_USE_TOOLS,
+    LMSTUDIO_CONCURRENCY,
 )
+from http_session import get_session, json_dumps, json_loads
 
+logger = logging.getLogger(__name__)
 
-print(
-    f"LM Studio config → BASE: {LMSTUDIO_BASE_URL}  MODEL: {LMSTUDIO_MODEL}  TIMEOUT: {LMSTUDIO_TIMEOUT}s"
-)
+# Endpoint and request headers never change at runtime, so resolve them
+# once instead of rebuilding the URL and header dict for every request.
+_LM_BASE_URL = (LMSTUDIO_BASE_URL or "").rstrip("/")
+_CHAT_ENDPOINT = f"{_LM_BASE_URL}/v1/chat/completions"
+_CHAT_HEADERS: Dict[str, str] = {"Content-Type": "application/json"}
+if LMSTUDIO_API_KEY:
+    _CHAT_HEADERS["Authorization"] = f"Bearer {LMSTUDIO_API_KEY}"
+
+# The /v1/models listing and the verdict on LMSTUDIO_MODEL are fetched once
+# (normally from on_ready) and reused, so summaries do not pay an extra
+# round-trip each. Both are dropped again on connection errors.
+_MODELS_CACHE: Optional[List[str]] = None
+_MODEL_OK: Optional[bool] = None
+_model_hint_shown: bool = False
+
+
+def _invalidate_models() -> None:
+    global _MODELS_CACHE, _MODEL_OK
+    _MODELS_CACHE = None
+    _MODEL_OK = None
 
 
-def lmstudio_models() -> List[str]:
+async def lmstudio_models() -> List[str]:
     # Return the list of available model identifiers from LM Studio.
+    global _MODELS_CACHE
+    if _MODELS_CACHE is not None:
+        return _MODELS_CACHE
     try:
-        url = f"{LMSTUDIO_BASE_URL.rstrip('/')}/v1/models"
-        r = requests.get(url, timeout=10)
-        r.raise_for_status()
-        data = r.json()
+        url = f"{_LM_BASE_URL}/v1/models"
+        session = await get_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as r:
+            r.raise_for_status()
+            data = json_loads(await r.read())
         ids = [m.get("id") for m in data.get("data", []) if isinstance(m, dict)]
-        print("LM Studio /v1/models →", ids)
-        return [m for m in ids if isinstance(m, str)]
+        logger.info("LM Studio /v1/models → %s", ids)
+        _MODELS_CACHE = [m for m in ids if isinstance(m, str)]
+        return _MODELS_CACHE
     except Exception as e:
-        print(f"⚠️ Could not reach LM Studio /v1/models: {e}")
+        logger.warning("⚠️ Could not reach LM Studio /v1/models: %s", e)
         return []
 
 
-def safe_json_parse(text: str) -> Optional[Any]:
+def safe_json_parse(text: Union[str, bytes]) -> Optional[Any]:
     try:
-        return json.loads(text)
+        return json_loads(text)
     except Exception:
         return None
 
 
+# The schema never changes at runtime, so build it once at import and hand
+# out the same object. Callers must treat it as read-only.
+_NEWS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "key_points": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 3,
+            "maxItems": 5,
+        },
+        "why_it_matters": {"type": "string"},
+    },
+    "required": ["title", "key_points", "why_it_matters"],
+    "additionalProperties": False,
+}
+
+
 def build_news_schema() -> Dict[str, Any]:
+    return _NEWS_SCHEMA
+
+
+@functools.lru_cache(maxsize=16)
+def looks_like_instruct_model(model_id: str) -> bool:
+    m = model_id.lower()
+    if "instruct" in m:
+        return True
+    return any(x in m for x in ["qwen", "mistral", "llama", "phi", "gemma"]) and not any(
+        y in m for y in ["r1", "reasoning"]
+    )
+
+
+def build_batch_schema(count: int) -> Dict[str, Any]:
+    # Wrap the per-article schema in an array of exactly ``count`` items.
     return {
         "type": "object",
         "properties": {
-            "title": {"type": "string"},
-            "key_points": {
+            "summaries": {
                 "type": "array",
-                "items": {"type": "string"},
-                "minItems": 3,
-                "maxItems": 5,
+                "items": _NEWS_SCHEMA,
+                "minItems": count,
+                "maxItems": count,
             },
-            "why_it_matters": {"type": "string"},
         },
-        "required": ["title", "key_points", "why_it_matters"],
+        "required": ["summaries"],
         "additionalProperties": False,
     }
 
 
-def looks_like_instruct_model(model_id: str) -> bool:
-    m = model_id.lower()
-    if "instruct" in m:
-        return True
-    return any(x in m for x in ["qwen", "mistral", "llama", "phi", "gemma"]) and not any(
-        y in m for y in ["r1", "reasoning"]
-    )
+# Request templates built once at import. Each call shallow-copies one and
+# only supplies its own "messages"; the nested schema, tool and
+# response_format objects are shared and must not be mutated.
+_LM_TIMEOUT = aiohttp.ClientTimeout(total=LMSTUDIO_TIMEOUT)
 
+_TOOLS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "summarize_article",
+            "description": "Summarize a news article for Discord in a structured way.",
+            "parameters": _NEWS_SCHEMA,
+        },
+    }
+]
 
-def summarize_with_lmstudio(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+_SCHEMA_SYSTEM_MESSAGE = {"role": "system", "content": "Return only what the schema requires."}
+_SCHEMA_PAYLOAD: Dict[str, Any] = {
+    "model": LMSTUDIO_MODEL,
+    "temperature": 0.1,
+    "max_tokens": 500,
+    "stream": True,
+    "response_format": {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "NewsSummary",
+            "schema": _NEWS_SCHEMA,
+            "strict": True,
+        },
+    },
+}
 
-    models = lmstudio_models()
-    if models and LMSTUDIO_MODEL not in models:
-        print(f"⚠️ Requested model '{LMSTUDIO_MODEL}' not in /v1/models. Use an exact id from the list above.")
-    if not looks_like_instruct_model(LMSTUDIO_MODEL):
-        print(
+_FALLBACK_SYSTEM_MESSAGE = {"role": "system", "content": "You are a crisp news summarizer for a Discord channel."}
+_FALLBACK_PAYLOAD: Dict[str, Any] = {
+    "model": LMSTUDIO_MODEL,
+    "temperature": 0.2,
+    "max_tokens": 600,
+    "stream": True,
+}
+if LM_USE_TOOLS:
+    _FALLBACK_PAYLOAD["tools"] = _TOOLS
+    _FALLBACK_PAYLOAD["tool_choice"] = {"type": "function", "function": {"name": "summarize_article"}}
+
+_PLAIN_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "Return ONLY a compact JSON object with keys: title (string), key_points (array of 3 short strings), why_it_matters (string).",
+}
+_PLAIN_PAYLOAD: Dict[str, Any] = {
+    "model": LMSTUDIO_MODEL,
+    "temperature": 0.1,
+    "max_tokens": 500,
+    "stream": True,
+}
+
+
+async def _check_model() -> None:
+    # Warn if the configured model is missing or unlikely to follow a schema.
+    # Runs the check once per successful model listing.
+    global _MODEL_OK, _model_hint_shown
+
+    if _MODEL_OK is None:
+        models = await lmstudio_models()
+        if models:
+            _MODEL_OK = LMSTUDIO_MODEL in models
+            if not _MODEL_OK:
+                logger.warning(
+                    "⚠️ Requested model '%s' not in /v1/models. Use an exact id from the list above.", LMSTUDIO_MODEL
+                )
+    if not _model_hint_shown and not looks_like_instruct_model(LMSTUDIO_MODEL):
+        _model_hint_shown = True
+        logger.info(
             "ℹ️ Hint: prefer an instruct model for structured output (e.g., qwen2.5-7b-instruct-mlx, llama-3.1-8b-instruct-mlx)."
         )
 
-    endpoint = f"{LMSTUDIO_BASE_URL.rstrip('/')}/v1/chat/completions"
-    headers: Dict[str, str] = {"Content-Type": "application/json"}
-    if LMSTUDIO_API_KEY:
-        headers["Authorization"] = f"Bearer {LMSTUDIO_API_KEY}"
 
-    desc = (article.get("summary") or "").strip()
-    title = (article.get("title") or "").strip()
-    src = (article.get("source") or "").strip()
-    url = (article.get("link") or "").strip()
+def _article_prompt(article: Dict[str, Any]) -> str:
+    # Truncate before stripping so only the part we send is copied.
+    desc = (article.get("summary") or "")[:2000].strip()
+    title = (article.get("title") or "")[:512].strip()
+    src = (article.get("source") or "")[:512].strip()
+    url = (article.get("link") or "")[:512].strip()
 
-    user_prompt = (
+    return (
         f"Source: {src}\nURL: {url}\nTitle: {title}\n\n"
-        f"Description snippet (may be partial):\n{desc[:2000]}"
+        f"Description snippet (may be partial):\n{desc}"
+    )
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _complete_json_prefix(text: str) -> Optional[str]:
+    # Return the first complete JSON object in ``text``, if one has closed yet.
+    start = text.find("{")
+    if start < 0:
+        return None
+    try:
+        _, end = _JSON_DECODER.raw_decode(text, start)
+    except ValueError:
+        return None
+    return text[start:end]
+
+
+async def _chat_message(
+    session: aiohttp.ClientSession,
+    endpoint: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    timeout: aiohttp.ClientTimeout,
+    soft_fail: Tuple[int, ...] = (),
+) -> Tuple[int, Dict[str, Any]]:
+    # POST a streaming chat completion and assemble the assistant message.
+    #
+    # Content deltas are accumulated as they arrive; as soon as they hold a
+    # complete JSON object the stream is closed, so we do not wait for (or
+    # pay for) any tokens the model emits after it. Returns the HTTP status
+    # and a ``message`` dict shaped like a non-streaming response. Statuses
+    # listed in ``soft_fail`` return an empty message instead of raising.
+    async with session.post(endpoint, headers=headers, data=json_dumps(payload), timeout=timeout) as r:
+        if r.status in soft_fail:
+            return r.status, {}
+        r.raise_for_status()
+        if r.content_type == "application/json":
+            # Server ignored "stream" and answered with a single body.
+            data = json_loads(await r.read())
+            return r.status, (data.get("choices") or [{}])[0].get("message", {})
+
+        content = ""
+        arguments = ""
+        async for raw in r.content:
+            # Parse the raw bytes directly; no need to decode each line first.
+            line = raw.strip()
+            if not line.startswith(b"data:"):
+                continue
+            chunk = line[5:].strip()
+            if chunk == b"[DONE]":
+                break
+            event = safe_json_parse(chunk)
+            if not isinstance(event, dict):
+                continue
+            delta = (event.get("choices") or [{}])[0].get("delta") or {}
+            for call in delta.get("tool_calls") or []:
+                if call.get("index", 0) == 0:
+                    arguments += (call.get("function") or {}).get("arguments") or ""
+            piece = delta.get("content")
+            if piece:
+                content += piece
+                complete = _complete_json_prefix(content)
+                if complete is not None:
+                    content = complete
+                    break
+
+    msg: Dict[str, Any] = {"content": content}
+    if arguments:
+        msg["tool_calls"] = [{"function": {"arguments": arguments}}]
+    return r.status, msg
+
+
+# Circuit breaker: after _LM_FAILURE_LIMIT consecutive failed summaries,
+# skip LM Studio entirely for _LM_COOLDOWN seconds so an outage costs one
+# timeout per article instead of three, and then none at all.
+_LM_FAILURE_LIMIT = 5
+_LM_COOLDOWN: float = 60.0
+_lm_failures: int = 0
+_lm_open_until: float = 0.0
+
+# Caps concurrent completions so a local model is not swamped with parallel
+# requests that would only queue inside LM Studio and inflate tail latency.
+_lm_sem: asyncio.Semaphore = asyncio.Semaphore(LMSTUDIO_CONCURRENCY)
+
+
+def _breaker_open() -> bool:
+    return time.monotonic() < _lm_open_until
+
+
+def _record_lm_result(ok: bool) -> None:
+    global _lm_failures, _lm_open_until
+    if ok:
+        _lm_failures = 0
+        return
+    _lm_failures += 1
+    if _lm_failures >= _LM_FAILURE_LIMIT:
+        _lm_open_until = time.monotonic() + _LM_COOLDOWN
+        _lm_failures = 0
+        logger.warning(
+            "⚠️ LM Studio failed %d times in a row; pausing summaries for %ds.", _LM_FAILURE_LIMIT, _LM_COOLDOWN
+        )
+
+
+# Which request style works for each model, learned from conclusive
+# responses: "schema" once JSON Schema mode has succeeded, "plain" once the
+# server has rejected it outright or it returned nothing usable
+# _EMPTY_LIMIT times in a row. Unknown models try schema mode first and
+# fall back through tools and plain JSON.
+_SCHEMA_REJECT_STATUSES = (400, 404, 415, 422)
+_mode_for_model: Dict[str, str] = {}
+# Models for which the tools/free-form fallback has been rejected or came
+# back empty _EMPTY_LIMIT times in a row; they go straight to the plain
+# JSON prompt.
+_TOOLS_BROKEN: Set[str] = set()
+
+# A single unparseable generation is not proof that a mode is unsupported,
+# so empty replies only count against it once they repeat.
+_EMPTY_LIMIT = 3
+_schema_misses: Dict[str, int] = {}
+_tools_misses: Dict[str, int] = {}
+
+
+def _note_miss(misses: Dict[str, int], model: str) -> bool:
+    # Count an unusable reply; True once _EMPTY_LIMIT have come in a row.
+    misses[model] = misses.get(model, 0) + 1
+    return misses[model] >= _EMPTY_LIMIT
+
+
+async def summarize_with_lmstudio(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if _breaker_open():
+        return None
+    async with _lm_sem:
+        result = await _summarize_one(article)
+    _record_lm_result(result is not None)
+    return result
+
+
+async def _summarize_one(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    await _check_model()
+
+    endpoint = _CHAT_ENDPOINT
+    headers = _CHAT_HEADERS
+    timeout = _LM_TIMEOUT
+    session = await get_session()
+
+    user_prompt = _article_prompt(article)
+
+    mode = _mode_for_model.get(LMSTUDIO_MODEL)
+    if mode != "plain":
+        rejected = False
+        schema_payload: Dict[str, Any] = {
+            **_SCHEMA_PAYLOAD,
+            "messages": [_SCHEMA_SYSTEM_MESSAGE, {"role": "user", "content": user_prompt}],
+        }
+
+        try:
+            status, msg = await _chat_message(
+                session, endpoint, headers, schema_payload, timeout, soft_fail=(400, 404, 415, 422, 500)
+            )
+            if status in (400, 404, 415, 422, 500):
+                logger.debug("JSON Schema mode not accepted (HTTP %s). Falling back.", status)
+                rejected = True
+                if status in _SCHEMA_REJECT_STATUSES:
+                    _mode_for_model[LMSTUDIO_MODEL] = "plain"
+            else:
+                parsed = msg.get("parsed")
+                if not (isinstance(parsed, dict) and parsed.get("title")):
+                    parsed = safe_json_parse((msg.get("content") or "").strip())
+                if isinstance(parsed, dict) and parsed.get("title"):
+                    _mode_for_model[LMSTUDIO_MODEL] = "schema"
+                    _schema_misses.pop(LMSTUDIO_MODEL, None)
+                    return parsed  # type: ignore[return-value]
+                logger.debug("JSON Schema mode returned no parsed object; falling back.")
+                if mode is None and _note_miss(_schema_misses, LMSTUDIO_MODEL):
+                    # Schema mode has never produced anything usable for
+                    # this model; stop spending a full generation on it.
+                    _mode_for_model[LMSTUDIO_MODEL] = "plain"
+        except aiohttp.ClientConnectionError as e:
+            logger.error("❌ Cannot connect to LM Studio at %s: %s", LMSTUDIO_BASE_URL, e)
+            _invalidate_models()
+            return None
+        except Exception as e:
+            logger.debug("JSON Schema attempt failed: %s. Falling back.", e)
+
+        if mode == "schema" and not rejected:
+            # Schema mode is known to work for this model and did answer,
+            # so the fallbacks would not fare better; give up on this
+            # article instead. A rejected request still falls back.
+            logger.warning("⚠️ No structured output from LM Studio in JSON Schema mode.")
+            return None
+
+    if LMSTUDIO_MODEL not in _TOOLS_BROKEN:
+        payload: Dict[str, Any] = {
+            **_FALLBACK_PAYLOAD,
+            "messages": [_FALLBACK_SYSTEM_MESSAGE, {"role": "user", "content": user_prompt}],
+        }
+
+        try:
+            status2, msg2 = await _chat_message(
+                session, endpoint, headers, payload, timeout, soft_fail=_SCHEMA_REJECT_STATUSES
+            )
+            if status2 in _SCHEMA_REJECT_STATUSES:
+                logger.info("ℹ️ Tool/JSON fallback not accepted (HTTP %s); skipping it from now on.", status2)
+                _TOOLS_BROKEN.add(LMSTUDIO_MODEL)
+            else:
+                content = (msg2.get("content") or "").strip()
+                parsed = safe_json_parse(content)
+                tool_calls = msg2.get("tool_calls") or []
+                if not (isinstance(parsed, dict) and parsed.get("title")) and tool_calls:
+                    try:
+                        parsed = safe_json_parse(tool_calls[0]["function"]["arguments"])
+                    except Exception as e:
+                        logger.debug("Failed to parse tool call arguments: %s", e)
+                if isinstance(parsed, dict) and parsed.get("title"):
+                    _tools_misses.pop(LMSTUDIO_MODEL, None)
+                    return parsed  # type: ignore[return-value]
+                if _note_miss(_tools_misses, LMSTUDIO_MODEL):
+                    logger.info("ℹ️ Tool/JSON fallback keeps returning no parsed object; skipping it from now on.")
+                    _TOOLS_BROKEN.add(LMSTUDIO_MODEL)
+                else:
+                    logger.debug("Tool/JSON fallback returned no parsed object.")
+        except Exception as e:
+            logger.debug("Tool/JSON fallback attempt failed: %s", e)
+
+    try:
+        plain: Dict[str, Any] = {
+            **_PLAIN_PAYLOAD,
+            "messages": [_PLAIN_SYSTEM_MESSAGE, {"role": "user", "content": user_prompt}],
+        }
+        _, msg3 = await _chat_message(session, endpoint, headers, plain, timeout)
+        content3 = (msg3.get("content") or "").strip()
+        parsed3 = safe_json_parse(content3)
+        if isinstance(parsed3, dict) and parsed3.get("title"):
+            return parsed3  # type: ignore[return-value]
+    except Exception as e:
+        logger.warning("⚠️ Plain JSON fallback failed: %s", e)
+
+    logger.warning("⚠️ No structured output from LM Studio after all attempts.")
+    return None
+
+
+def _pick_summaries(obj: Any, count: int) -> Optional[List[Optional[Dict[str, Any]]]]:
+    # Extract ``count`` per-article summaries from a batch response object,
+    # with None for missing or invalid items. Returns None when not a
+    # single item is usable.
+    if not isinstance(obj, dict):
+        return None
+    items = obj.get("summaries")
+    if not isinstance(items, list) or not items:
+        return None
+    picked: List[Optional[Dict[str, Any]]] = []
+    for i in range(count):
+        item = items[i] if i < len(items) else None
+        picked.append(item if isinstance(item, dict) and item.get("title") else None)
+    if not any(picked):
+        return None
+    return picked
+
+
+async def summarize_batch_with_lmstudio(
+    articles: List[Dict[str, Any]],
+) -> List[Optional[Dict[str, Any]]]:
+    # Summarize several articles with a single chat completion. The result
+    # has one entry per input article, None where no summary came back.
+    count = len(articles)
+    if count == 0:
+        return []
+    if count == 1:
+        return [await summarize_with_lmstudio(articles[0])]
+    if _breaker_open():
+        return [None] * count
+    if _mode_for_model.get(LMSTUDIO_MODEL) == "plain":
+        # The batch request relies on JSON Schema mode, which this model rejects.
+        return [await summarize_with_lmstudio(a) for a in articles]
+
+    await _check_model()
+
+    endpoint = _CHAT_ENDPOINT
+    headers = _CHAT_HEADERS
+    # The batch asks for up to 500 tokens per article, so give it the
+    # per-article time budget for each of them.
+    timeout = aiohttp.ClientTimeout(total=LMSTUDIO_TIMEOUT * count)
+    session = await get_session()
+
+    sections = [f"## Article {i}\n{_article_prompt(a)}" for i, a in enumerate(articles, start=1)]
+    user_prompt = (
+        f"Summarize each of the following {count} articles, in order, "
+        f"returning one summary per article.\n\n" + "\n\n".join(sections)
     )
 
-    schema_payload: Dict[str, Any] = {
+    batch_payload: Dict[str, Any] = {
         "model": LMSTUDIO_MODEL,
         "messages": [
-            {"role": "system", "content": "Return only what the schema requires."},
+            _SCHEMA_SYSTEM_MESSAGE,
             {"role": "user", "content": user_prompt},
         ],
         "temperature": 0.1,
-        "max_tokens": 500,
+        "max_tokens": 500 * count,
+        "stream": True,
         "response_format": {
             "type": "json_schema",
             "json_schema": {
-                "name": "NewsSummary",
-                "schema": build_news_schema(),
+                "name": "NewsSummaryBatch",
+                "schema": build_batch_schema(count),
                 "strict": True,
             },
         },
     }
 
     try:
-        r = requests.post(endpoint, headers=headers, json=schema_payload, timeout=LMSTUDIO_TIMEOUT)
-        if r.status_code in (400, 404, 415, 422, 500):
-            print(f"ℹ️ JSON Schema mode not accepted (HTTP {r.status_code}). Falling back.")
-        else:
-            r.raise_for_status()
-            data = r.json()
-            msg = (data.get("choices") or [{}])[0].get("message", {})
-            parsed = msg.get("parsed")
-            if isinstance(parsed, dict) and parsed.get("title"):
-                return parsed  # type: ignore[return-value]
-            content = (msg.get("content") or "").strip()
-            parsed2 = safe_json_parse(content)
-            if isinstance(parsed2, dict) and parsed2.get("title"):
-                return parsed2  # type: ignore[return-value]
-            print("ℹ️ JSON Schema mode returned no parsed object; falling back.")
-    except requests.exceptions.ConnectionError as e:
-        print(f"❌ Cannot connect to LM Studio at {LMSTUDIO_BASE_URL}: {e}")
-        return None
-    except Exception as e:
-        print(f"ℹ️ JSON Schema attempt failed: {e}. Falling back.")
-
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "summarize_article",
-                "description": "Summarize a news article for Discord in a structured way.",
-                "parameters": build_news_schema(),
-            },
-        }
-    ]
-
-    payload: Dict[str, Any] = {
-        "model": LMSTUDIO_MODEL,
-        "messages": [
-            {"role": "system", "content": "You are a crisp news summarizer for a Discord channel."},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": 0.2,
-        "max_tokens": 600,
-    }
-    if LM_USE_TOOLS:
-        payload["tools"] = tools
-        payload["tool_choice"] = {"type": "function", "function": {"name": "summarize_article"}}
-
-    try:
-        r2 = requests.post(endpoint, headers=headers, json=payload, timeout=LMSTUDIO_TIMEOUT)
-        r2.raise_for_status()
-        data2 = r2.json()
-        msg2 = (data2.get("choices") or [{}])[0].get("message", {})
-        content = (msg2.get("content") or "").strip()
-        parsed = safe_json_parse(content)
-        if isinstance(parsed, dict) and parsed.get("title"):
-            return parsed  # type: ignore[return-value]
-        tool_calls = msg2.get("tool_calls") or []
-        if tool_calls:
-            try:
-                arguments = tool_calls[0]["function"]["arguments"]
-                parsed2 = safe_json_parse(arguments)
-                if isinstance(parsed2, dict) and parsed2.get("title"):
-                    return parsed2  # type: ignore[return-value]
-            except Exception as e:
-                print(f"⚠️ Failed to parse tool call arguments: {e}")
-    except Exception as e:
-        print(f"ℹ️ Tool/JSON fallback attempt failed: {e}")
-
-    try:
-        plain = {
-            "model": LMSTUDIO_MODEL,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "Return ONLY a compact JSON object with keys: title (string), key_points (array of 3 short strings), why_it_matters (string).",
-                },
-                {"role": "user", "content": user_prompt},
-            ],
-            "temperature": 0.1,
-            "max_tokens": 500,
-        }
-        r3 = requests.post(endpoint, headers=headers, json=plain, timeout=LMSTUDIO_TIMEOUT)
-        r3.raise_for_status()
-        data3 = r3.json()
-        msg3 = (data3.get("choices") or [{}])[0].get("message", {})
-        content3 = (msg3.get("content") or "").strip()
-        parsed3 = safe_json_parse(content3)
-        if isinstance(parsed3, dict) and parsed3.get("title"):
-            return parsed3  # type: ignore[return-value]
+        async with _lm_sem:
+            _, msg = await _chat_message(session, endpoint, headers, batch_payload, timeout)
+        picked = _pick_summaries(msg.get("parsed"), count) or _pick_summaries(
+            safe_json_parse((msg.get("content") or "").strip()), count
+        )
+        if picked:
+            _record_lm_result(True)
+            # Retry only the articles the batch left out or got wrong.
+            for i, summary in enumerate(picked):
+                if summary is None:
+                    picked[i] = await summarize_with_lmstudio(articles[i])
+            return picked
+        _record_lm_result(False)
+        logger.info("ℹ️ Batch summary returned no parsed object; summarizing one by one.")
+    except aiohttp.ClientConnectionError as e:
+        logger.error("❌ Cannot connect to LM Studio at %s: %s", LMSTUDIO_BASE_URL, e)
+        _invalidate_models()
+        _record_lm_result(False)
+        return [None] * count
     except Exception as e:
-        print(f"⚠️ Plain JSON fallback failed: {e}")
+        _record_lm_result(False)
+        logger.info("ℹ️ Batch summary attempt failed: %s. Summarizing one by one.", e)
 
-    print("⚠️ No structured output from LM Studio after all attempts.")
-    return None
\ No newline at end of file
+    return [await summarize_with_lmstudio(a) for a in articles]
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
 
 from config import (
     ensure_token,
+    ensure_required,
     DISCORD_TOKEN,
     ADMIN_CHANNEL_ID,
     POST_CHANNEL_ID,
+    LMSTUDIO_BASE_URL,
+    LMSTUDIO_MODEL,
+    LMSTUDIO_TIMEOUT,
 )
 from lmstudio_helpers import lmstudio_models
-from discord_bot import bot
+from news import load_topics_from_file
+from discord_bot import bot, resolve_channels, seed_recent_article_urls
 from tasks import (
     fetch_and_post_articles,
     reset_queries_every_morning,
@@ -17,23 +24,40 @@ from tasks import (
     list_accessible_text_channels,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def main() -> None:
+    logging.basicConfig(
+        level=os.getenv("LOGLEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
     ensure_token()
+    ensure_required()
+    logger.info(
+        "LM Studio config → BASE: %s  MODEL: %s  TIMEOUT: %ss", LMSTUDIO_BASE_URL, LMSTUDIO_MODEL, LMSTUDIO_TIMEOUT
+    )
+    # Loaded here rather than at import so the result is logged.
+    load_topics_from_file()
 
     @bot.event
     async def on_ready() -> None:
-        print(f"✅ Bot is ready! Logged in as {bot.user}")
-        lmstudio_models()
+        logger.info("✅ Bot is ready! Logged in as %s", bot.user)
+        resolve_channels()
+        await lmstudio_models()
         # List channels and check permissions
         await list_accessible_text_channels()
         await check_channel_perms(ADMIN_CHANNEL_ID, "Admin channel")
         await check_channel_perms(POST_CHANNEL_ID, "Public channel")
+        # Seed the duplicate-URL cache once instead of scanning history per fetch
+        await seed_recent_article_urls()
         # Schedule background tasks
         bot.loop.create_task(fetch_and_post_articles())
         bot.loop.create_task(reset_queries_every_morning())
 
-    bot.run(DISCORD_TOKEN)
+    # Logging is configured above; stop discord.py from adding a second
+    # handler that would print its records twice.
+    bot.run(DISCORD_TOKEN, log_handler=None)
 
 
 if __name__ == "__main__":
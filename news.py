@@ -1,110 +1,193 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import random
-import requests
-from typing import Dict, List, Optional, Set
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import aiohttp
 
 # Import dependencies with absolute names to allow running this
 # module directly without a package context.
 from config import NEWS_API_KEY
-from lmstudio_helpers import summarize_with_lmstudio
+from http_session import get_session, json_loads
+from lmstudio_helpers import summarize_batch_with_lmstudio
+
+logger = logging.getLogger(__name__)
 
-available_queries: List[str] = []
-used_queries: List[str] = []
+available_queries: Set[str] = set()
+used_queries: Set[str] = set()
 
 
 def load_topics_from_file(file_path: str = "topics.txt") -> List[str]:
     # Load news topics from a text file.
     topics: List[str] = []
     try:
-        with open(file_path, "r") as file:
-            topics = [line.strip() for line in file if line.strip()]
-        print(f"✅ Loaded {len(topics)} topics from {file_path}.")
+        lines = Path(file_path).read_text(encoding="utf-8").splitlines()
+        topics = [topic for topic in (line.strip() for line in lines) if topic]
+        logger.info("✅ Loaded %d topics from %s.", len(topics), file_path)
     except FileNotFoundError:
-        print(f"❌ ERROR: {file_path} not found. Please create the file and add topics.")
+        logger.error("❌ %s not found. Please create the file and add topics.", file_path)
         topics = []
-    available_queries.extend(topics)
+    available_queries.update(topics)
     return topics
 
 
-load_topics_from_file()
-
-
-async def handle_api_limit() -> None:
-    # Wait for the NewsAPI rate limit to reset.
-    print("⏳ Waiting for API rate limit to reset...")
-    sleep_seconds = 15 * 60  # Wait 15 minutes
-    while sleep_seconds > 0:
-        await asyncio.sleep(min(60, sleep_seconds))
-        sleep_seconds -= 60
-        print(
-            f"⏳ Still waiting for API rate limit to reset... {sleep_seconds // 60} minutes remaining."
-        )
-    print("✅ Resuming article fetching after API rate limit reset.")
+async def handle_api_limit(retry_after: Optional[str] = None) -> None:
+    # Wait for the NewsAPI rate limit to reset. Honour the server's
+    # Retry-After (in seconds) when given, otherwise wait 15 minutes, and add
+    # up to 10% jitter so retries do not line up with other clients.
+    try:
+        sleep_seconds = max(0.0, float(retry_after)) if retry_after else 15 * 60
+    except ValueError:
+        sleep_seconds = 15 * 60
+    sleep_seconds += random.uniform(0, sleep_seconds * 0.1)
+    logger.info("⏳ Waiting %ds for API rate limit to reset...", sleep_seconds)
+    await asyncio.sleep(sleep_seconds)
+    logger.info("✅ Resuming article fetching after API rate limit reset.")
+
+
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+# Query parameters shared by every NewsAPI request; only "q" varies.
+_NEWSAPI_PARAMS: Dict[str, Any] = {
+    "apiKey": NEWS_API_KEY,
+    "language": "en",
+    "pageSize": 1,
+}
+# NewsAPI answers in well under a second; don't inherit the long LM Studio
+# timeout from the shared session.
+_NEWSAPI_TIMEOUT = aiohttp.ClientTimeout(total=20)
+
+# Number of queries drawn per fetch, and the most that are probed at once
+# in a single wave.
+_QUERY_SAMPLE = 10
+_QUERY_CONCURRENCY = 5
+
+
+class _RateLimited(Exception):
+    # Raised by a query probe when NewsAPI answers 429.
+
+    def __init__(self, retry_after: Optional[str] = None) -> None:
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+async def _try_query(
+    session: aiohttp.ClientSession,
+    query: str,
+    recent_urls: Set[str],
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    # Probe a single query. Returns (query, article) for a fresh hit,
+    # None for an empty result, a duplicate or a request error.
+    params = {**_NEWSAPI_PARAMS, "q": query}
+    try:
+        logger.debug("Fetching articles for query: %s from: %s", query, NEWSAPI_URL)
+        async with session.get(NEWSAPI_URL, params=params, timeout=_NEWSAPI_TIMEOUT) as response:
+            if response.status == 429:
+                raise _RateLimited(response.headers.get("Retry-After"))
+            response.raise_for_status()
+            data = json_loads(await response.read())
+
+        # A malformed body must count as a miss for this query, not
+        # escape and take the fetch task down with it.
+        articles = data.get("articles") or []
+        if not articles:
+            logger.debug("No articles found for query: %s. Trying next query...", query)
+            return None
+        article = articles[0]
+        url = article.get("url")
+        if url in recent_urls:
+            logger.debug("Skipping previously posted article: %s", url)
+            return None
+        return query, article
+    except _RateLimited:
+        raise
+    except Exception as e:
+        logger.warning("❌ Failed to fetch article for query: %s: %s", query, e)
+        return None
 
 
-async def fetch_article(recent_urls: Set[str]) -> Optional[Dict[str, object]]:
+async def fetch_articles(recent_urls: Set[str], count: int = 1) -> List[Dict[str, object]]:
+    # Fetch up to ``count`` fresh articles, each from a different query,
+    # and summarize them with LM Studio in a single batched request.
     global available_queries, used_queries
 
     if not NEWS_API_KEY:
-        print("❌ ERROR: NEWS_API_KEY is not set. Set it in your environment or a .env file.")
-        return None
+        logger.error("❌ NEWS_API_KEY is not set. Set it in your environment or a .env file.")
+        return []
 
     if not available_queries:
-        print("🔄 No available queries left. Resetting queries...")
-        available_queries.extend(used_queries)
+        logger.info("🔄 No available queries left. Resetting queries...")
+        available_queries.update(used_queries)
         used_queries.clear()
-        print(f"✅ Queries reset. {len(available_queries)} queries are now available.")
-
-    random.shuffle(available_queries)
-
-    api_url = "https://newsapi.org/v2/everything"
-    params = {
-        "apiKey": NEWS_API_KEY,
-        "language": "en",
-        "pageSize": 1,
-    }
-
-    for query in list(available_queries):
-        params["q"] = query
-        try:
-            print(f"Fetching articles for query: {query} from: {api_url}")
-            response = requests.get(api_url, params=params)
-            if response.status_code == 429:
-                print("❌ ERROR: API rate limit reached (429). Entering a wait state.")
-                await handle_api_limit()
-                return None
-            response.raise_for_status()
-            data = response.json()
-            articles = data.get("articles") or []
-            if articles:
-                article = articles[0]
-                url = article.get("url")
-                if url in recent_urls:
-                    print(f"⚠️ Skipping previously posted article: {url}")
-                    continue
-                # Move the query to the used list
-                available_queries.remove(query)
-                used_queries.append(query)
-                result: Dict[str, object] = {
-                    "title": article.get("title", ""),
-                    "source": (article.get("source") or {}).get("name", ""),
-                    "summary": article.get("description") or "No description available.",
-                    "link": url,
-                }
-                lm_summary = summarize_with_lmstudio(result)
-                if lm_summary:
-                    result["summary"] = lm_summary  # Use LM Studio summary if available
-                else:
-                    print(
-                        "ℹ️ Using NewsAPI description as summary (LM Studio unavailable or failed)."
-                    )
-                return result
-            else:
-                print(f"❌ No articles found for query: {query}. Trying next query...")
-        except Exception as e:
-            print(f"❌ ERROR: Failed to fetch article for query: {query}: {e}")
-
-    print("❌ No articles found for any query.")
-    return None
\ No newline at end of file
+        logger.info("✅ Queries reset. %d queries are now available.", len(available_queries))
+
+    # Draw a random handful of queries rather than shuffling the whole pool.
+    candidates = random.sample(list(available_queries), min(_QUERY_SAMPLE, len(available_queries)))
+
+    # Probe in waves. The first wave asks only for as many queries as
+    # articles are wanted, so a hit on the first probe costs a single
+    # NewsAPI request; after a miss, later waves fan out to
+    # _QUERY_CONCURRENCY queries at a time so a run of misses costs a few
+    # round trips rather than one per query.
+    session = await get_session()
+    hits: List[Tuple[str, Dict[str, Any]]] = []
+    seen_urls: Set[str] = set()
+    rate_limit: Optional[_RateLimited] = None
+    next_index = 0
+    while len(hits) < count and next_index < len(candidates) and rate_limit is None:
+        wave_size = min(count, _QUERY_CONCURRENCY) if next_index == 0 else _QUERY_CONCURRENCY
+        wave = candidates[next_index : next_index + wave_size]
+        next_index += len(wave)
+        outcomes = await asyncio.gather(
+            *(_try_query(session, query, recent_urls) for query in wave),
+            return_exceptions=True,
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, _RateLimited):
+                rate_limit = outcome
+            elif isinstance(outcome, Exception):
+                logger.warning("❌ Unexpected error while probing queries: %s", outcome)
+            elif outcome and outcome[1].get("url") not in seen_urls:
+                seen_urls.add(outcome[1].get("url"))
+                hits.append(outcome)
+        # A wide wave may land more hits than needed; keep the first ones.
+        del hits[count:]
+
+    if rate_limit is not None:
+        logger.error("❌ API rate limit reached (429). Entering a wait state.")
+        await handle_api_limit(rate_limit.retry_after)
+        return []
+
+    if not hits:
+        logger.warning("❌ No articles found for any query.")
+        return []
+
+    results: List[Dict[str, object]] = []
+    for query, article in hits:
+        results.append(
+            {
+                "title": article.get("title", ""),
+                "source": (article.get("source") or {}).get("name", ""),
+                "summary": article.get("description") or "No description available.",
+                "link": article.get("url"),
+            }
+        )
+
+    lm_summaries = await summarize_batch_with_lmstudio(results)
+    for (query, _), result, lm_summary in zip(hits, results, lm_summaries):
+        # The article is posted either way, so its query is used up: left
+        # available it would keep returning this now-duplicate article.
+        available_queries.discard(query)
+        used_queries.add(query)
+        if lm_summary:
+            result["summary"] = lm_summary  # Use LM Studio summary if available
+        else:
+            logger.info("ℹ️ Using NewsAPI description as summary (LM Studio unavailable or failed).")
+    return results
+
+
+async def fetch_article(recent_urls: Set[str]) -> Optional[Dict[str, object]]:
+    results = await fetch_articles(recent_urls, 1)
+    return results[0] if results else None
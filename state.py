@@ -1,7 +1,81 @@
 from __future__ import annotations
 
-import asyncio
+import json
+import logging
+import os
+import time
+from typing import Iterable, List, Optional
 
-unactioned_articles: list[dict] = []
+from config import STATE_FILE
 
-unactioned_articles_lock: asyncio.Lock = asyncio.Lock()
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+# Articles awaiting moderation, keyed by the random ``_id`` assigned when
+# each article is queued. Only the fetch task adds entries and only the
+# moderation buttons remove them, each with a single dict operation that
+# never spans an await, so no lock is needed.
+pending_articles: dict[str, dict] = {}
+
+# Restored articles queued longer ago than this are dropped: their review
+# message has most likely been deleted or forgotten, and keeping them would
+# grow the state file forever.
+_PENDING_MAX_AGE: float = 7 * 24 * 3600
+
+# Article keys that only live in memory (e.g. the cached discord.Embed)
+# and are left out of the state file.
+_TRANSIENT_KEYS = frozenset({"_embed"})
+
+
+def save_state(recent_urls: Iterable[str]) -> None:
+    # Persist the moderation queue and recent article links to STATE_FILE.
+    # The file is written to a temporary path and swapped in with
+    # os.replace so a crash mid-write never leaves a truncated file.
+    payload = {
+        "unactioned": [
+            {k: v for k, v in article.items() if k not in _TRANSIENT_KEYS}
+            for article in pending_articles.values()
+        ],
+        "recent_urls": list(recent_urls),
+    }
+    tmp_path = f"{STATE_FILE}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, STATE_FILE)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("⚠️ Could not save state to %s: %s", STATE_FILE, e)
+
+
+def load_state() -> Optional[List[str]]:
+    # Restore the moderation queue from STATE_FILE and return the saved
+    # recent article links, or None if there is no usable state file.
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("⚠️ Could not load state from %s: %s", STATE_FILE, e)
+        return None
+    if not isinstance(payload, dict):
+        return None
+
+    cutoff = time.time() - _PENDING_MAX_AGE
+    for article in payload.get("unactioned") or []:
+        if not isinstance(article, dict):
+            continue
+        # Entries without an id or queue time predate persistent review
+        # buttons, so nothing can ever moderate them; skip those and stale ones.
+        article_id = article.get("_id")
+        queued_at = article.get("_queued_at")
+        if not isinstance(article_id, str) or not isinstance(queued_at, (int, float)) or queued_at < cutoff:
+            continue
+        pending_articles[article_id] = article
+    recent_urls = [str(u) for u in payload.get("recent_urls") or [] if u]
+    logger.info(
+        "✅ Restored %d pending articles and %d recent links from %s.",
+        len(pending_articles),
+        len(recent_urls),
+        STATE_FILE,
+    )
+    return recent_urls